@@ -1,6 +1,12 @@
 import streamlit as st
-import requests
-import pandas as pd
+import io
+from leetcode_api import CACHE_TTL, fetch_all_users
+
+# Maximum number of usernames accepted from an uploaded file
+MAX_USERNAMES = 200
+
+# Most sorted DataFrames kept in the Streamlit cache at once
+DATAFRAME_CACHE_ENTRIES = 32
 
 # Step 1: Input Handling from a .txt file
 def get_usernames_from_file(uploaded_file):
@@ -8,123 +14,67 @@ def get_usernames_from_file(uploaded_file):
     Fetch a list of usernames from the uploaded .txt file.
     """
     try:
-        usernames = []
-        # Read file content
-        content = uploaded_file.getvalue().decode("utf-8")
-        # Split the file content into lines and strip any whitespace
-        usernames = [line.strip() for line in content.splitlines()]
-        
-        # Ensure the number of usernames does not exceed 100
-        if len(usernames) > 200:
-            st.error("The number of usernames cannot exceed 100.")
+        # Stream the upload line by line instead of copying it with getvalue()
+        # and splitting it into a second list; blank lines are skipped
+        uploaded_file.seek(0)
+        text = io.TextIOWrapper(uploaded_file, encoding="utf-8")
+        try:
+            lines = [line.strip() for line in text if line.strip()]
+        finally:
+            # Detach, even if decoding fails, so the wrapper never closes the uploaded file
+            text.detach()
+
+        # Drop duplicate usernames (keeping the first occurrence) so each is fetched once
+        usernames = list(dict.fromkeys(lines))
+        if len(usernames) < len(lines):
+            st.info(f"Skipped {len(lines) - len(usernames)} duplicate usernames.")
+
+        # Ensure the number of usernames does not exceed MAX_USERNAMES
+        if len(usernames) > MAX_USERNAMES:
+            st.error(f"The number of usernames cannot exceed {MAX_USERNAMES}.")
             return []
         return usernames
     except Exception as e:
         st.error(f"Error reading file: {e}")
         return []
 
-# Step 2: Fetch User Data from LeetCode GraphQL API
-def fetch_user_data(username):
-    """
-    Fetches LeetCode user profile data using the GraphQL API.
-    :param username: LeetCode username.
-    :return: A dictionary containing user data or an error message.
+# Step 4: Display Data in Streamlit as a Proper Table
+@st.cache_data(ttl=CACHE_TTL, max_entries=DATAFRAME_CACHE_ENTRIES, show_spinner=False)
+def build_dataframe(data):
     """
-    url = "https://leetcode.com/graphql"
-    headers = {
-        "Content-Type": "application/json",
-        "Referer": f"https://leetcode.com/{username}/",
-        "User-Agent": "Mozilla/5.0 (compatible; LeetCodeFetcher/1.0)"
-    }
-
-    query = """
-    query getUserProfile($username: String!) {
-      matchedUser(username: $username) {
-        username
-        profile {
-          realName
-          userAvatar
-          ranking
-        }
-        submitStats {
-          acSubmissionNum {
-            difficulty
-            count
-          }
-        }
-        badges {
-          displayName
-        }
-      }
-    }
+    Builds the sorted table of user data.
+    Cached on the contents of data, so Streamlit reruns with the same users
+    skip the DataFrame construction and sort.
+    :param data: List of dictionaries containing user data.
+    :return: A pandas DataFrame sorted by ranking, indexed from 1.
     """
-    payload = {
-        "operationName": "getUserProfile",
-        "query": query,
-        "variables": {"username": username}
-    }
+    # Imported lazily so app startup does not pay for pandas until there is data to show
+    import pandas as pd
 
-    # Send the POST request to the GraphQL endpoint
-    response = requests.post(url, json=payload, headers=headers)
+    # Sort by 'ranking' (in ascending order to get the best ranked first),
+    # with unranked users and errors last. Sorting the small list up front
+    # is cheaper than sorting and re-indexing the DataFrame afterwards.
+    data = sorted(data, key=lambda user: (user.get("ranking") is None, user.get("ranking") or 0))
 
-    if response.status_code != 200:
-        return {"username": username, "error": f"API error: {response.status_code}"}
+    # Show badges as a single comma-separated cell
+    data = [
+        {**user, "badges": ", ".join(user["badges"]) if user["badges"] else "None"} if "badges" in user else user
+        for user in data
+    ]
 
-    try:
-        # Parse the JSON response
-        data = response.json()
-        if "errors" in data:
-            return {"username": username, "error": data["errors"]}
-
-        user_data = data["data"]["matchedUser"]
-        if not user_data:
-            return {"username": username, "error": "User not found."}
-
-        profile = user_data["profile"]
-        submissions = user_data["submitStats"]["acSubmissionNum"]
-        badges = user_data.get("badges", [])
-
-        return {
-            "username": username,
-            "ranking": profile["ranking"],
-            "problems_solved": sum(item["count"] for item in submissions)//2,
-            "badges": ", ".join([badge["displayName"] for badge in badges]) if badges else "None"
-        }
-    except ValueError as e:
-        return {"username": username, "error": f"Invalid API response: {e}"}
-
-# Step 3: Fetch Data for All Users
-def fetch_all_users(usernames):
-    """
-    Fetches data for multiple LeetCode usernames.
-    :param usernames: List of usernames
-    :return: A list of user data dictionaries
-    """
-    results = []
-    for username in usernames:
-        user_data = fetch_user_data(username)
-        results.append(user_data)
-    return results
+    # Convert the list of dictionaries into a pandas DataFrame for better table display
+    df = pd.DataFrame(data)
+    df.index = range(1, len(df) + 1)  # Set the index to start from 1
+    return df
 
-# Step 4: Display Data in Streamlit as a Proper Table
 def display_data(data):
     """
     Displays user data in a table format in Streamlit using st.dataframe().
     :param data: List of dictionaries containing user data.
     """
     if data:
-        # Convert the list of dictionaries into a pandas DataFrame for better table display
-        df = pd.DataFrame(data)
-
-        # Sort by 'ranking' (in ascending order to get the best ranked first)
-        df.sort_values(by='ranking', ascending=True, inplace=True)
-
-        # Reset the index and start from 1
-        df.reset_index(drop=True, inplace=True)
-        df.index += 1  # Set the index to start from 1
-
         # Display the DataFrame as an interactive table in Streamlit
-        st.dataframe(df)
+        st.dataframe(build_dataframe(data))
     else:
         st.warning("No data to display.")
 
@@ -140,10 +90,11 @@ def main():
         usernames = get_usernames_from_file(uploaded_file)
 
         if usernames:
+            refresh = st.button("Refresh data")
             st.write(f"Fetching data for {len(usernames)} users...")
 
-            # Step 3: Fetch user data
-            user_data_list = fetch_all_users(usernames)
+            # Step 3: Fetch user data (served from cache unless a refresh was requested)
+            user_data_list = fetch_all_users(usernames, bypass_cache=refresh)
 
             # Step 4: Display data as a proper table
             display_data(user_data_list)
@@ -0,0 +1,287 @@
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of GraphQL requests kept in flight at once. Kept small so LeetCode
+# does not throttle or reset a burst of simultaneous connections.
+MAX_WORKERS = 20
+
+# Seconds to wait for a connection and for each read from the socket, so a
+# stalled connection cannot block a worker indefinitely
+REQUEST_TIMEOUT = (5, 30)
+
+# Retry throttled or unavailable responses with exponential backoff
+# (a few seconds in total). Retry-After is ignored because an arbitrarily
+# long value would stall the whole run.
+RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=(429, 503),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=False,
+    raise_on_status=False
+)
+
+# Shared HTTP session so every request reuses the same keep-alive connection
+# instead of paying a fresh TCP + TLS handshake per user. All request headers
+# are constant, so they are set once here rather than passed on every call.
+SESSION = requests.Session()
+SESSION.headers.update({
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (compatible; LeetCodeFetcher/1.0)",
+    "Referer": "https://leetcode.com/"
+})
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=RETRY))
+
+# Maximum number of users aliased into a single batched GraphQL document
+BATCH_SIZE = 50
+
+# Seconds a fetched user stays cached, and the most users kept in the cache
+CACHE_TTL = 3600
+CACHE_MAXSIZE = 4096
+
+# LeetCode GraphQL endpoint
+GRAPHQL_URL = "https://leetcode.com/graphql"
+
+# Selection set requested for every matched user, limited to the fields parse_user_data reads
+USER_FIELDS = """{
+    username
+    profile {
+      ranking
+    }
+    submitStats {
+      acSubmissionNum {
+        count
+      }
+    }
+    badges {
+      displayName
+    }
+  }"""
+
+class FetchError(Exception):
+    """
+    Raised when a request to the LeetCode API fails.
+    Failures are raised rather than returned so that they are never cached.
+    """
+
+class UserCache:
+    """
+    Thread-safe cache of fetched user rows, keyed by username.
+    Entries expire after `ttl` seconds and the least recently used are evicted
+    beyond `maxsize`. Rows are copied on the way in and out, so callers can
+    modify the rows they get back without changing the cache.
+    """
+
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, username):
+        """
+        :param username: LeetCode username.
+        :return: A copy of the cached row, or None if it is missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(username)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self.entries[username]
+                return None
+            self.entries.move_to_end(username)
+        return copy.deepcopy(user)
+
+    def set(self, username, user):
+        """
+        :param username: LeetCode username.
+        :param user: Row to cache for username.
+        """
+        user = copy.deepcopy(user)
+        with self.lock:
+            self.entries[username] = (time.monotonic() + self.ttl, user)
+            self.entries.move_to_end(username)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, usernames):
+        """
+        Drops the cached rows for the given usernames only.
+        :param usernames: Iterable of usernames.
+        """
+        with self.lock:
+            for username in usernames:
+                self.entries.pop(username, None)
+
+USER_CACHE = UserCache(ttl=CACHE_TTL, maxsize=CACHE_MAXSIZE)
+
+def parse_user_data(username, user_data, error="User not found."):
+    """
+    Converts a matchedUser object from the GraphQL response into a result row.
+    :param username: LeetCode username.
+    :param user_data: The matchedUser object, or None if the user was not matched.
+    :param error: Error message to report when user_data is None.
+    :return: A dictionary containing user data or an error message.
+    :raises FetchError: If user_data does not have the expected shape.
+    """
+    if not user_data:
+        return {"username": username, "error": error}
+
+    try:
+        profile = user_data["profile"]
+        submissions = user_data["submitStats"]["acSubmissionNum"]
+        badges = user_data.get("badges") or []
+
+        return {
+            "username": username,
+            "ranking": profile["ranking"],
+            "problems_solved": sum(item["count"] for item in submissions)//2,
+            "badges": [badge["displayName"] for badge in badges]
+        }
+    except (KeyError, TypeError, AttributeError) as e:
+        raise FetchError(f"Invalid API response: malformed data for {username} ({e!r}).")
+
+def format_errors(errors):
+    """
+    Joins the messages of GraphQL error objects into one readable string.
+    :param errors: List of GraphQL error dictionaries.
+    :return: The messages separated by "; ", or an empty string if there are none.
+    """
+    return "; ".join(str(error.get("message", "Unknown error")) for error in errors)
+
+@functools.lru_cache(maxsize=None)
+def build_batch_query(size):
+    """
+    Builds the batched GraphQL query for a batch of `size` usernames, aliased u0..u{size-1}.
+    Almost every batch is BATCH_SIZE long, so the query string is built once and reused.
+    :param size: Number of usernames in the batch.
+    :return: The GraphQL query string.
+    """
+    params = ", ".join(f"$u{i}: String!" for i in range(size))
+    selections = "\n  ".join(
+        f"u{i}: matchedUser(username: $u{i}) {USER_FIELDS}" for i in range(size)
+    )
+    return f"query getUserProfiles({params}) {{\n  {selections}\n}}"
+
+# Fetch User Data from LeetCode GraphQL API
+def fetch_batch(usernames):
+    """
+    Fetches several LeetCode user profiles with a single batched GraphQL request.
+    Each username is aliased as its own matchedUser selection, so the whole
+    batch costs one HTTP round trip.
+    :param usernames: Tuple of usernames (at most BATCH_SIZE).
+    :return: A list of user data dictionaries, in the same order as usernames.
+        Users that are not found or have malformed data get an error row.
+    :raises FetchError: If the API request fails.
+    """
+    variables = {f"u{i}": username for i, username in enumerate(usernames)}
+    payload = {
+        "operationName": "getUserProfiles",
+        "query": build_batch_query(len(usernames)),
+        "variables": variables
+    }
+
+    # Send the POST request to the GraphQL endpoint. The body is encoded with
+    # orjson, which is much faster than the stdlib json used by json=; the
+    # Content-Type header is already set on the session.
+    try:
+        response = SESSION.post(GRAPHQL_URL, data=orjson.dumps(payload), timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        raise FetchError(f"Request failed: {e}")
+
+    if response.status_code != 200:
+        raise FetchError(f"API error: {response.status_code}")
+
+    try:
+        # Parse the raw JSON body with orjson, which is faster than response.json()
+        data = orjson.loads(response.content)
+    except ValueError as e:
+        raise FetchError(f"Invalid API response: {e}")
+
+    if not isinstance(data, dict):
+        raise FetchError("Invalid API response: expected a JSON object.")
+
+    errors = data.get("errors")
+    if not isinstance(errors, list):
+        errors = []
+    errors = [error for error in errors if isinstance(error, dict)]
+
+    matched = data.get("data")
+    if not isinstance(matched, dict) or not matched:
+        raise FetchError(format_errors(errors) or "Invalid API response: no data returned.")
+
+    # Unknown users come back as null aliases with an error pointing at the alias
+    alias_errors = {
+        error["path"][0]: str(error.get("message", "User not found."))
+        for error in errors
+        if isinstance(error.get("path"), list) and error["path"]
+    }
+
+    users = []
+    for alias, username in variables.items():
+        # A malformed user only fails its own row, not the rest of the batch
+        try:
+            users.append(parse_user_data(username, matched.get(alias), alias_errors.get(alias, "User not found.")))
+        except FetchError as e:
+            users.append({"username": username, "error": str(e)})
+    return users
+
+def fetch_batch_or_errors(usernames):
+    """
+    Fetches a batch of users and caches the successful rows. A failed request
+    becomes per-user error rows; error rows are never cached, since they may
+    come from transient server failures.
+    :param usernames: Tuple of usernames (at most BATCH_SIZE).
+    :return: A list of user data dictionaries, in the same order as usernames
+    """
+    try:
+        users = fetch_batch(usernames)
+    except FetchError as e:
+        return [{"username": username, "error": str(e)} for username in usernames]
+
+    for user in users:
+        if "error" not in user:
+            USER_CACHE.set(user["username"], user)
+    return users
+
+# Fetch Data for All Users
+def fetch_all_users(usernames, bypass_cache=False):
+    """
+    Fetches data for multiple LeetCode usernames.
+    Cached users are served from USER_CACHE; the rest are split into batches
+    of BATCH_SIZE, and the batches are fetched concurrently.
+    :param usernames: List of usernames
+    :param bypass_cache: If True, drop the cached rows for these usernames and refetch them.
+    :return: A list of user data dictionaries, in the same order as usernames
+    """
+    if bypass_cache:
+        USER_CACHE.invalidate(usernames)
+
+    # Only usernames missing from the cache are fetched
+    cached = [USER_CACHE.get(username) for username in usernames]
+    misses = [username for username, user in zip(usernames, cached) if user is None]
+    batches = [tuple(misses[i:i + BATCH_SIZE]) for i in range(0, len(misses), BATCH_SIZE)]
+
+    if len(batches) <= 1:
+        # A single batch needs no worker threads
+        fetched = [user for batch in batches for user in fetch_batch_or_errors(batch)]
+    else:
+        # Each batch is independent and I/O-bound, so run them in parallel.
+        # requests releases the GIL while waiting on the socket, and every worker
+        # draws a keep-alive connection from the shared SESSION pool.
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches))) as executor:
+            fetched = [user for batch in executor.map(fetch_batch_or_errors, batches) for user in batch]
+
+    # Fill the cache misses back in, in their original order
+    fetched = iter(fetched)
+    return [user if user is not None else next(fetched) for user in cached]
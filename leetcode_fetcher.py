@@ -1,6 +1,8 @@
 import argparse
-import requests
-from prettytable import PrettyTable
+from leetcode_api import fetch_all_users
+
+# Maximum number of usernames accepted from a file or the command line
+MAX_USERNAMES = 100
 
 # Step 1: Input Handling
 def get_usernames():
@@ -30,95 +32,17 @@ def get_usernames():
     else:
         raise ValueError("Provide either a file path or a list of usernames.")
 
-    # Ensure the number of usernames does not exceed 100
-    if len(usernames) > 100:
-        raise ValueError("The number of usernames cannot exceed 100.")
-
-    return usernames
-
-# Step 2: Fetch User Data from LeetCode GraphQL API
-def fetch_user_data(username):
-    """
-    Fetches LeetCode user profile data using the GraphQL API.
-    :param username: LeetCode username.
-    :return: A dictionary containing user data or an error message.
-    """
-    url = "https://leetcode.com/graphql"
-    headers = {
-        "Content-Type": "application/json",
-        "Referer": f"https://leetcode.com/{username}/",
-        "User-Agent": "Mozilla/5.0 (compatible; LeetCodeFetcher/1.0)"
-    }
-
-    # GraphQL query to fetch user profile data
-    query = """
-    query getUserProfile($username: String!) {
-      matchedUser(username: $username) {
-        username
-        profile {
-          realName
-          userAvatar
-          ranking
-        }
-        submitStats {
-          acSubmissionNum {
-            difficulty
-            count
-          }
-        }
-        badges {
-          displayName
-        }
-      }
-    }
-    """
-    payload = {
-        "operationName": "getUserProfile",
-        "query": query,
-        "variables": {"username": username}
-    }
-
-    # Send the POST request to the GraphQL endpoint
-    response = requests.post(url, json=payload, headers=headers)
+    # Drop blank entries and duplicates (keeping the first occurrence) so each user is fetched once
+    names = [username for username in usernames if username]
+    usernames = list(dict.fromkeys(names))
+    if len(usernames) < len(names):
+        print(f"Skipped {len(names) - len(usernames)} duplicate usernames.")
 
-    if response.status_code != 200:
-        return {"username": username, "error": f"API error: {response.status_code}"}
+    # Ensure the number of usernames does not exceed MAX_USERNAMES
+    if len(usernames) > MAX_USERNAMES:
+        raise ValueError(f"The number of usernames cannot exceed {MAX_USERNAMES}.")
 
-    try:
-        # Parse the JSON response
-        data = response.json()
-        if "errors" in data:
-            return {"username": username, "error": data["errors"]}
-
-        user_data = data["data"]["matchedUser"]
-        if not user_data:
-            return {"username": username, "error": "User not found."}
-
-        profile = user_data["profile"]
-        submissions = user_data["submitStats"]["acSubmissionNum"]
-        badges = user_data.get("badges", [])
-
-        return {
-            "username": username,
-            "ranking": profile["ranking"],
-            "problems_solved": sum(item["count"] for item in submissions)//2,
-            "badges": [badge["displayName"] for badge in badges]
-        }
-    except ValueError as e:
-        return {"username": username, "error": f"Invalid API response: {e}"}
-
-# Step 3: Fetch Data for All Users
-def fetch_all_users(usernames):
-    """
-    Fetches data for multiple LeetCode usernames.
-    :param usernames: List of usernames
-    :return: A list of user data dictionaries
-    """
-    results = []
-    for username in usernames:
-        user_data = fetch_user_data(username)
-        results.append(user_data)
-    return results
+    return usernames
 
 # Step 4: Display Data in a Table Format
 def display_data(data):
@@ -126,19 +50,23 @@ def display_data(data):
     Displays user data in a table-like format.
     :param data: List of dictionaries containing user data.
     """
+    # Imported lazily so argument errors are reported without loading prettytable
+    from prettytable import PrettyTable
+
     table = PrettyTable()
     table.field_names = ["Username", "Ranking", "Problems Solved", "Badges"]
 
-    for user in data:
-        if "error" in user:
-            table.add_row([user["username"], "Error", "-", "-"])
-        else:
-            table.add_row([
-                user["username"],
-                user["ranking"] or "N/A",
-                user["problems_solved"],
-                ", ".join(user["badges"]) if user["badges"] else "None"
-            ])
+    # Build every row first and add them in one add_rows call
+    rows = [
+        [user["username"], "Error", "-", "-"] if "error" in user else [
+            user["username"],
+            user["ranking"] or "N/A",
+            user["problems_solved"],
+            ", ".join(user["badges"]) if user["badges"] else "None"
+        ]
+        for user in data
+    ]
+    table.add_rows(rows)
 
     print(table)
 